@@ -10,7 +10,6 @@ from __future__ import annotations
 import copy
 import os
 import re
-from locale import LC_ALL, setlocale
 from typing import Callable, Iterable, Optional, Sequence, TypeAlias
 from warnings import warn
 
@@ -23,7 +22,12 @@ from scipy.sparse import spmatrix
 from pubnet.network import _edge
 from pubnet.network._edge._base import Edge
 from pubnet.network._node import Node
-from pubnet.network._utils import edge_key, edge_parts, select_graph_components
+from pubnet.network._utils import (
+    edge_key,
+    edge_parts,
+    select_graph_components,
+    set_user_locale,
+)
 from pubnet.storage import delete_graph, graph_path, list_graphs
 
 __all__ = ["edge_key", "PubNet", "Edge", "Node"]
@@ -303,7 +307,7 @@ class PubNet:
         return self
 
     def __repr__(self) -> str:
-        setlocale(LC_ALL, "")
+        set_user_locale()
 
         def sep(name, col_len):
             return " " * (col_len - len(name))
@@ -1036,7 +1040,7 @@ class PubNet:
         def rule(node):
             strings = node.feature_vector(feature)
             re_filter = (
-                (i, re.search(pattern, s)) for i, s in zip(node.index, strings)
+                (i, pattern.search(s)) for i, s in zip(node.index, strings)
             )
             return np.fromiter(
                 (
@@ -1179,7 +1183,11 @@ class PubNet:
         data_dir : str, optional
             Where to save the graph, defaults to the default data directory.
         file_format : {"tsv", "gzip", "binary"}, default "tsv"
-            How to store the files.
+            How to store the files. "binary" stores nodes as feather files and
+            edges as npy files, it is the fastest to read and write and is
+            preferred when loading a graph that has multiple formats saved.
+            The plain text formats are useful for sharing the graph with other
+            tools.
         keep_index : bool, default True
             Whether to keep the current node indices or reset them (default)
             before saving. Resetting the index ensures the node IDs are
@@ -6,6 +6,7 @@ from typing import Any, Optional
 
 import igraph as ig
 import numpy as np
+import pandas as pd
 from numpy.typing import NDArray
 
 from pubnet.network._utils import (
@@ -79,29 +80,38 @@ def from_file(file_name: str, representation: str) -> Edge:
     start_id, end_id, feature_ids, col_idx = edge_header_parts(header_line)
     if ext == "npy":
         data = np.load(file_name, allow_pickle=True)
+        features = {
+            feat: data[:, col + 2] for col, feat in enumerate(feature_ids)
+        }
+        data = data[:, :2]
     elif ext == "pickle":
         data = ig.Graph.Read_Pickle(file_name)
+        if representation == "numpy":
+            features = {feat: data.es[feat] for feat in feature_ids}
+        else:  # Features are already in the graph.
+            features = {}
     else:
-        data = np.genfromtxt(
+        # Use pandas' C parser, `np.genfromtxt` parses line by line in
+        # python. Splitting on any whitespace matches `genfromtxt`'s default.
+        table = pd.read_csv(
             file_name,
-            # All edge values should be integer IDs.
-            skip_header=1,
+            sep=r"\s+",
+            header=None,
+            names=range(len(col_idx)),
+            skiprows=1,
+            engine="c",
         )
-
-        data = data[:, col_idx]
-
-    if isinstance(data, np.ndarray) and data.shape[1] > 2:
+        # Pull columns out separately so float features don't force the IDs
+        # through a float array.
         features = {
-            feat: data[:, col + 2] for col, feat in enumerate(feature_ids)
+            feat: table.iloc[:, col].to_numpy()
+            for feat, col in zip(feature_ids, col_idx[2:])
         }
-        data = data[:, :2]
-    elif isinstance(data, ig.Graph) and representation == "numpy":
-        features = {feat: data.es[feat] for feat in feature_ids}
-    else:  # If data is an igraph.Graph, features are already in the graph
-        features = {}
+        data = table.iloc[:, list(col_idx[:2])].to_numpy(dtype=id_dtype)
 
     if isinstance(data, np.ndarray):
-        data = data.astype(id_dtype)
+        # Binary edges with float features are stored as a float array.
+        data = data.astype(id_dtype, copy=False)
 
     return from_data(data, name, features, start_id, end_id, representation)
 
@@ -113,7 +123,7 @@ def from_data(
     start_id: Optional[str] = None,
     end_id: Optional[str] = None,
     representation: str = "numpy",
-    dtype: type = id_dtype,
+    dtype: Optional[type] = None,
 ) -> Edge:
     """Make an edge from data.
 
@@ -133,9 +143,9 @@ def from_data(
        The name of the to and from node types. If `data` is a ndarray, must be
        provided. For DataFrames, the IDs can be detected based on the column
        names.
-    dtype : type
-       Edge list data type passed to numpy array. Only applicable if using the
-       "numpy" backend.
+    dtype : type, optional
+       Edge list data type passed to numpy array. If None, use 32-bit integers
+       when every ID fits, otherwise `id_dtype`.
 
     Returns
     -------
@@ -155,12 +165,37 @@ def from_data(
     start_id = start_id or start_id_i
     end_id = end_id or end_id_i
     name = name or edge_key(start_id, end_id)
+    if dtype is None:
+        dtype = _smallest_id_dtype(data)
 
     return _edge_class[representation](
         data, name, start_id, end_id, dtype, features=features
     )
 
 
+def _smallest_id_dtype(data) -> type:
+    """Find the smallest integer type that can hold every ID in data.
+
+    Halves the memory used by the edge list, and the sparse matrices built
+    from it, when the IDs allow it.
+    """
+    if isinstance(data, ig.Graph):
+        # Vertices are numbered from 0 so the vertex count bounds the IDs.
+        smallest, largest = 0, data.vcount() - 1
+    else:
+        data = np.asarray(data)
+        if data.size == 0:
+            return np.int32
+
+        smallest, largest = data.min(), data.max()
+
+    int32 = np.iinfo(np.int32)
+    if int32.min <= smallest and largest <= int32.max:
+        return np.int32
+
+    return id_dtype
+
+
 def from_edge(edge: Edge, representation: str) -> Edge:
     """Construct a new edge from a preexisting edge.
 
@@ -1,14 +1,20 @@
 """Abstract base class for storing edges."""
 
 import os
-from locale import LC_ALL, setlocale
 from typing import Any, Optional
 
 import numpy as np
+import pandas as pd
 from numpy.typing import ArrayLike, NDArray
 from scipy import sparse as sp
+from scipy.sparse.csgraph import connected_components, dijkstra
 
-from pubnet.network._utils import edge_gen_file_name, edge_gen_header, edge_key
+from pubnet.network._utils import (
+    edge_gen_file_name,
+    edge_gen_header,
+    edge_key,
+    set_user_locale,
+)
 
 
 class Edge:
@@ -69,6 +75,7 @@ class Edge:
 
         self.name = name.title()
         self._n_iter = 0
+        self._iter_edges = None
         self.start_id = start_id
         self.end_id = end_id
         self.representation = "Generic"
@@ -78,9 +85,18 @@ class Edge:
     def set_data(self, new_data) -> None:
         """Replace the edge's data with a new array."""
         self._data = new_data
+        self._clear_cache()
+
+    def _clear_cache(self) -> None:
+        """Forget values derived from the edges.
+
+        Must be called any time the edges are modified.
+        """
+        self._adjacency_cache: dict[tuple, sp.spmatrix] = {}
+        self._distance_cache: Optional[tuple[NDArray[Any], sp.spmatrix]] = None
 
     def __str__(self) -> str:
-        setlocale(LC_ALL, "")
+        set_user_locale()
 
         col_names = [
             f"from: {self.start_id}",
@@ -88,21 +104,26 @@ class Edge:
         ] + self.features()
         col_len = max(max(len(n) for n in col_names) + 2, 8)
 
-        def align_row(elements):
-            def to_str(el):
-                if isinstance(el, str):
-                    return el
+        def to_str(el):
+            if isinstance(el, str):
+                return el
 
-                if el == int(el):
-                    return str(int(el))
+            if el == int(el):
+                return str(int(el))
 
-                return f"{el:g}"
+            return f"{el:g}"
 
-            cells = (
-                to_str(el) + " " * (col_len - len(to_str(el)))
-                for el in elements
+        def align_row(elements):
+            return "".join(to_str(el).ljust(col_len) for el in elements)
+
+        def align_rows(idx):
+            # Gather only the displayed rows instead of slicing out a new
+            # edge set, which would rebuild the backend's data structure.
+            rows = np.column_stack(
+                [self._edges()[idx]]
+                + [self.feature_vector(f)[idx] for f in self.features()]
             )
-            return "".join(cells)
+            return "\n".join(align_row(row) for row in rows.tolist())
 
         header = align_row(col_names)
 
@@ -117,14 +138,10 @@ class Edge:
             first_edges = 5
             last_edges = 5
 
-        edges = "\n".join(
-            align_row(line) for line in self[:first_edges].as_array()
-        )
+        edges = align_rows(slice(first_edges))
         if last_edges > 0:
             edges += f"\n{align_row(['...'] * len(col_names))}\n"
-            edges += "\n".join(
-                align_row(line) for line in self[-last_edges:].as_array()
-            )
+            edges += align_rows(slice(-last_edges, None))
         return "\n".join((n_edges, header, edges))
 
     def __repr__(self) -> str:
@@ -147,36 +164,66 @@ class Edge:
 
         return (types.difference({node_type})).pop()
 
+    @property
+    def start_id(self) -> str:
+        """The node type in column 0."""
+        return self._start_id
+
+    @start_id.setter
+    def start_id(self, node_type: str) -> None:
+        self._start_id = node_type
+        self._column_indices: dict[str | int, tuple[int, int]] | None = None
+
+    @property
+    def end_id(self) -> str:
+        """The node type in column 1."""
+        return self._end_id
+
+    @end_id.setter
+    def end_id(self, node_type: str) -> None:
+        self._end_id = node_type
+        self._column_indices = None
+
     def _column_to_indices(self, key: str | int) -> tuple[int, int]:
         """Return the index for the provided key and the other key."""
+        if self._column_indices is None:
+            start = (0, 1)
+            end = (1, 0)
+            # End is added first so start takes precedence when both columns
+            # are the same node type.
+            self._column_indices = {
+                self.end_id: end,
+                self.end_id.title(): end,
+                self.start_id: start,
+                self.start_id.title(): start,
+                "from": start,
+                "From": start,
+                "to": end,
+                "To": end,
+                0: start,
+                1: end,
+            }
+
+        try:
+            return self._column_indices[key]
+        except (KeyError, TypeError):
+            pass
+
         if isinstance(key, int):
-            if key == 0:
-                primary = 0
-                secondary = 1
-            elif key == 1:
-                primary = 1
-                secondary = 0
-            else:
-                raise IndexError(
-                    "Index out of range. Column index must be 0 or 1."
-                )
-        elif isinstance(key, str):
-            key = key.title()
-            if key == self.start_id.title() or key == "From":
-                primary = 0
-                secondary = 1
-            elif key == self.end_id.title() or key == "To":
-                primary = 1
-                secondary = 0
-            else:
-                raise KeyError(
-                    f'Key "{key}" not one of "{self.start_id}" or'
-                    f' "{self.end_id}".'
-                )
-        else:
+            raise IndexError(
+                "Index out of range. Column index must be 0 or 1."
+            )
+
+        if not isinstance(key, str):
             raise TypeError("Id must be a string or integer.")
 
-        return (primary, secondary)
+        try:
+            return self._column_indices[key.title()]
+        except KeyError:
+            raise KeyError(
+                f'Key "{key.title()}" not one of "{self.start_id}" or'
+                f' "{self.end_id}".'
+            ) from None
 
     def _parse_key(self, key) -> tuple[Any, Any]:
         """Parse a key to get the correct row and column indices."""
@@ -203,18 +250,43 @@ class Edge:
 
         return (row_index, col_index)
 
+    def _is_mask(self, arr):
+        if not isinstance(arr, np.ndarray):
+            return False
+
+        if arr.dtype.kind != "b":
+            return False
+
+        if arr.ndim != 1:
+            raise KeyError("Boolean mask must be one dimensional")
+
+        if arr.shape[0] != len(self):
+            raise KeyError(
+                "Boolean mask must have same size as edge set for indexing"
+            )
+
+        return True
+
     def __getitem__(self, key):
         raise AbstractMethodError(self)
 
     def __iter__(self):
         self._n_iter = 0
+        # Index into a single copy of the edges instead of going through
+        # `__getitem__` for every row.
+        self._iter_edges = self._edges()
         return self
 
     def __next__(self):
-        if self._n_iter == len(self):
+        if (
+            self._iter_edges is None
+            or self._n_iter >= self._iter_edges.shape[0]
+        ):
+            # Release the edges once exhausted, later calls keep stopping.
+            self._iter_edges = None
             raise StopIteration
 
-        res = self[self._n_iter,]
+        res = self._iter_edges[self._n_iter]
         self._n_iter += 1
         return res
 
@@ -228,8 +300,26 @@ class Edge:
     def isin(
         self, column: str | int, test_elements: ArrayLike
     ) -> NDArray[np.bool_]:
-        """Find the elements of column that are in `test_elements`."""
-        raise AbstractMethodError(self)
+        """Check which elements of column are members of test_elements.
+
+        Parameters
+        ----------
+        column : str, int
+            The column to test, can be anything accepted by `__getitem__`.
+        test_elements : np.ndarray
+            The elemnts to test against.
+
+        Returns
+        -------
+        isin : np.ndarray
+            a boolean array of the same size as self[column], such that all
+            elements of self[column][isin] are in the set test_elements.
+
+        """
+        # Test against a view of the stored edges instead of building the
+        # column through `__getitem__`.
+        col = self._column_to_indices(column)[0]
+        return np.isin(self._edges()[:, col], test_elements)
 
     @property
     def isweighted(self):
@@ -257,7 +347,16 @@ class Edge:
 
     def isequal(self, other):
         """Determine if two edges are equivalent."""
-        raise AbstractMethodError(self)
+        if self.start_id != other.start_id:
+            return False
+
+        if self.end_id != other.end_id:
+            return False
+
+        if len(self) != len(other):
+            return False
+
+        return np.array_equal(self._edges(), other._edges())
 
     def distribution(self, column):
         """Return the distribution of the nodes in column."""
@@ -279,8 +378,8 @@ class Edge:
             The name of the edge. If None, use the edge's name.
         file_format : str {"tsv", "gzip", "binary"}
             How to store the edge (default "tsv"). The gzip method uses
-            compresses the tsv. Binary uses numpy's npy file format or pickle
-            depending on the edge backend.
+            compresses the tsv. Binary uses numpy's npy file format for all
+            edge backends.
 
         Returns
         -------
@@ -296,12 +395,7 @@ class Edge:
         if edge_name is None:
             edge_name = self.name
 
-        ext = {"gzip": "tsv.gz", "tsv": "tsv"}
-
-        if self.representation == "igraph":
-            ext["binary"] = "pickle"
-        elif self.representation == "numpy":
-            ext["binary"] = "npy"
+        ext = {"binary": "npy", "gzip": "tsv.gz", "tsv": "tsv"}
 
         if not os.path.exists(data_dir):
             os.mkdir(data_dir)
@@ -317,20 +411,56 @@ class Edge:
         if file_format == "binary":
             self._to_binary(file_name, header_name, header)
         else:
-            # `np.savetxt` handles "gz" extensions so nothing extra to do.
+            # `to_csv` handles "gz" extensions so nothing extra to do.
             self._to_tsv(file_name, header)
 
     def _to_binary(self, file_name, header_name, header):
         """Save an edge to a binary file type."""
-        raise AbstractMethodError(self)
+        np.save(file_name, self.as_array())
+        with open(header_name, "wt") as header_file:
+            header_file.write(header)
 
-    def _renumber_column(self, col: str, id_map: dict[int, int]) -> None:
-        """Renumber column based on map: old_index -> new_index."""
+    def _renumber_column(self, col: str, new_ids: NDArray[Any]) -> None:
+        """Replace the IDs in column col with new_ids."""
         raise AbstractMethodError(self)
 
     def _to_tsv(self, file_name, header):
-        """Save an edge to a tsv."""
-        raise AbstractMethodError(self)
+        """Save an edge to a tsv.
+
+        Uses pyarrow's multithreaded csv writer when the optional dependency
+        is installed and falls back to pandas' C writer otherwise. Either way
+        compression is inferred from the file name's extension.
+        """
+        edges = self._edges()
+        columns = [edges[:, 0], edges[:, 1]] + [
+            np.asarray(self.feature_vector(f)) for f in self.features()
+        ]
+        # Format floats up front so both writers produce the same text and
+        # integral floats keep their decimal point when read back.
+        columns = [
+            c.astype(str) if c.dtype.kind == "f" else c for c in columns
+        ]
+        table = dict(zip(header.split("\t"), columns))
+
+        try:
+            import pyarrow as pa
+            from pyarrow import csv
+        except ImportError:
+            pd.DataFrame(table).to_csv(file_name, sep="\t", index=False)
+            return
+
+        with pa.output_stream(file_name, compression="detect") as f:
+            # Written separately since pyarrow would quote the column names.
+            f.write(f"{header}\n".encode())
+            csv.write_csv(
+                pa.table(table),
+                f,
+                csv.WriteOptions(
+                    include_header=False,
+                    delimiter="\t",
+                    quoting_style="none",
+                ),
+            )
 
     def get_edgelist(self):
         """Return a list of edges.
@@ -342,9 +472,17 @@ class Edge:
         """
         raise AbstractMethodError(self)
 
+    def _edges(self) -> NDArray[Any]:
+        """Return the edge list without copying it when possible.
+
+        Unlike `get_edgelist`, the result may share memory with the edge's
+        data so it must not be modified.
+        """
+        return self.get_edgelist()
+
     def as_array(self):
         """Return the edge list as a numpy array."""
-        edges = self.get_edgelist()
+        edges = self._edges()
         feats = tuple(
             np.expand_dims(np.asarray(self.feature_vector(f)), axis=1)
             for f in self.features()
@@ -356,10 +494,88 @@ class Edge:
         raise AbstractMethodError(self)
 
     def to_sparse_matrix(
-        self, row=None, column=None, weights=None, shape=None
+        self,
+        row: Optional[str] = None,
+        column: Optional[str] = None,
+        weights: Optional[str | NDArray[Any]] = None,
+        shape: Optional[tuple[int, int]] = None,
     ) -> sp.spmatrix:
-        """Create a sparse matrix from edge list and a feature."""
-        raise AbstractMethodError(self)
+        """Create a csr sparse matrix from the edge data.
+
+        Exactly one of row or column must be specified. If left blank, weights
+        will be one for all non-zero elements.
+
+        Returns a new matrix that is safe to modify.
+        """
+        if isinstance(weights, np.ndarray):
+            return self._build_sparse_matrix(row, column, weights, shape)
+
+        return self._sparse_matrix(row, column, weights, shape).copy()
+
+    def _sparse_matrix(
+        self,
+        row: Optional[str] = None,
+        column: Optional[str] = None,
+        weights: Optional[str | NDArray[Any]] = None,
+        shape: Optional[tuple[int, int]] = None,
+    ) -> sp.spmatrix:
+        """Like `to_sparse_matrix` but may return a shared matrix.
+
+        Matrices that are unweighted or weighted by a feature name are cached
+        until the edges or that feature change. The result is shared between
+        calls so it must not be modified, only use it internally.
+        """
+        if not isinstance(weights, np.ndarray):
+            key = (row, column, weights, shape)
+            if key not in self._adjacency_cache:
+                self._adjacency_cache[key] = self._build_sparse_matrix(
+                    row, column, weights, shape
+                )
+
+            return self._adjacency_cache[key]
+
+        return self._build_sparse_matrix(row, column, weights, shape)
+
+    def _build_sparse_matrix(
+        self,
+        row: Optional[str],
+        column: Optional[str],
+        weights: Optional[str | NDArray[Any]],
+        shape: Optional[tuple[int, int]],
+    ) -> sp.spmatrix:
+        edges = self._edges()
+        if weights is None:
+            # Sums of unweighted edges, such as overlap counts, can't exceed
+            # the number of edges so size the type from that, not the IDs.
+            n_edges = edges.shape[0]
+            dtype = np.int32 if n_edges <= np.iinfo(np.int32).max else np.int64
+            _weights = np.ones((n_edges,), dtype=dtype)
+        elif isinstance(weights, np.ndarray):
+            if weights.shape[0] != edges.shape[0]:
+                raise ValueError(
+                    "Weights must have the same number of rows as edges."
+                )
+            _weights = weights
+        else:
+            _weights = np.asarray(self.feature_vector(weights))
+
+        if row and column and row != self.other_node(column):
+            raise KeyError(
+                "Over-specified matrix. Provide one of row or column."
+            )
+
+        if row:
+            primary, secondary = self._column_to_indices(row)
+        elif column:
+            secondary, primary = self._column_to_indices(column)
+        else:
+            raise KeyError("One of row or column must be specified")
+
+        return sp.coo_matrix(
+            (_weights, (edges[:, primary], edges[:, secondary])),
+            dtype=_weights.dtype,
+            shape=shape,
+        ).tocsr()
 
     def from_sparse_matrix(
         self,
@@ -371,19 +587,16 @@ class Edge:
     ):
         """Create a new edge based on the sparse matrix."""
         mat = mat.tocoo()
-        new_edge = self.__class__(
+        features = {} if feature_name is None else {feature_name: mat.data}
+        return self.__class__(
             np.stack((mat.row, mat.col), axis=1),
             name,
             start_id=start_id,
             end_id=end_id,
             dtype=self.dtype,
+            features=features,
         )
 
-        if feature_name is not None:
-            new_edge.add_feature(mat.data, feature_name)
-
-        return new_edge
-
     def _compose_with(self, other, counts: str, mode: str):
         """Use other to create a new edge set that transverses both edges.
 
@@ -397,22 +610,52 @@ class Edge:
         """
         raise AbstractMethodError(self)
 
-    def overlap(self, node_type: str, weights: Optional[str]):
-        """Pairwise number of neighbors nodes have in common.
+    def overlap(
+        self, node_type: str, weights: Optional[str | NDArray[Any]] = None
+    ) -> "Edge":
+        """Calculate the neighbor overlap between nodes.
 
-        For every pair of nodes of the given node type, calculate the number of
-        neighbors they have in common.
+        For all pairs of nodes in the node_type column, calculate the number of
+        nodes both are connected to.
 
         Parameters
         ----------
         node_type : str
-            The name of one of the columns in the edge set.
-        weights : str, optional
-            If not none, used to weigh neighbors. Weights should be the name of
-            a feature in the edge set.
+            The node_type column to use. In an "Author--Publication" edge set,
+            If node_type is "Author", overlap will be the number of
+            publications each author has in common with every other author.
+        weights : str, np.ndarray, optional
+            If left None, each edge will be counted equally. Otherwise weight
+            edges based on the edge's feature with the provided name or the
+            array of weights. If the edge doesn't have the passed feature, an
+            error will be raised.
+
+        Returns
+        -------
+        overlap : Edge
+            A new edge set with the same representation as self. The edges will
+            have edges between all nodes with non-zero overlap and it will
+            contain a feature "overlap".
 
         """
-        raise AbstractMethodError(self)
+        if len(self) == 0:
+            res = sp.coo_matrix(np.array([]))
+        else:
+            adj = self._sparse_matrix(row=node_type, weights=weights)
+            res = adj @ adj.T
+            # Sorting keeps the overlap edges ordered by node. Offsetting the
+            # diagonal drops self overlap without having to build and
+            # subtract a diagonal matrix.
+            res.sort_indices()
+            res = sp.triu(res, k=1, format="coo")
+
+        return self.from_sparse_matrix(
+            res,
+            edge_key(node_type, f"{self.other_node(node_type)}Overlap"),
+            start_id=node_type,
+            end_id=node_type,
+            feature_name="overlap",
+        )
 
     def similarity(self, target_publications, method="shortest_path"):
         """Calculate similarity between publications based on edge's overlap.
@@ -446,8 +689,100 @@ class Edge:
                 f"'{type(self).__name__}'"
             )
 
-    def _shortest_path(self, target_publications):
-        raise AbstractMethodError(self)
+    def _overlap_distances(self) -> tuple[NDArray[Any], sp.spmatrix]:
+        """Distances between start nodes based on their overlap.
+
+        Each overlap edge is weighted as 1 / overlap. The overlap is only
+        calculated the first time a similarity is requested and reused until
+        the edges change.
+
+        Returns
+        -------
+        nodes : np.ndarray
+            The sorted start nodes with a non-zero overlap.
+        distances : scipy.sparse.csr_matrix
+            Upper triangular sparse distance matrix. Row and column i
+            correspond to nodes[i].
+
+        """
+        if self._distance_cache is None:
+            overlap = self.overlap(self.start_id)
+            # Renumber nodes densely so the matrix, and every distance array
+            # Dijkstra allocates, only spans nodes that have an overlap.
+            nodes, dense_edges = np.unique(
+                overlap._edges(), return_inverse=True
+            )
+            dense_edges = dense_edges.reshape((-1, 2))
+            weights = 1 / np.asarray(
+                overlap.feature_vector("overlap"), dtype=float
+            )
+            self._distance_cache = (
+                nodes,
+                sp.csr_matrix(
+                    (weights, (dense_edges[:, 0], dense_edges[:, 1])),
+                    shape=(nodes.shape[0], nodes.shape[0]),
+                ),
+            )
+
+        return self._distance_cache
+
+    def _shortest_path(self, target_nodes):
+        """Calculate shortest path between target nodes.
+
+        Paths are found on the overlap between the edge's start nodes, where
+        each overlap edge is weighted as 1 / overlap. Uses scipy's compiled
+        Dijkstra's algorithm on a sparse adjacency matrix, so only target
+        nodes are used as sources. Targets in different connected components
+        can't reach each other, so Dijkstra is run separately within each
+        component containing at least two targets.
+        """
+        nodes, adj = self._overlap_distances()
+        if nodes.shape[0] == 0:
+            return np.zeros((0, 3))
+
+        target_nodes = np.unique(target_nodes)
+        target_nodes = target_nodes[np.isin(target_nodes, nodes)]
+        target_idx = np.searchsorted(nodes, target_nodes)
+
+        _, labels = connected_components(adj, directed=False)
+        # Group node indices by component. A stable sort keeps each group
+        # sorted so it can be searched and the sub-matrix stays triangular.
+        by_component = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(
+            labels[by_component], np.arange(labels.max() + 2)
+        )
+
+        target_dist = np.full((target_idx.shape[0],) * 2, np.inf)
+        target_labels = labels[target_idx]
+        targets_by_component = np.argsort(target_labels, kind="stable")
+        components, starts, counts = np.unique(
+            target_labels[targets_by_component],
+            return_index=True,
+            return_counts=True,
+        )
+        for comp, start, count in zip(components, starts, counts):
+            if count < 2:
+                continue
+
+            members = by_component[bounds[comp] : bounds[comp + 1]]
+            in_comp = targets_by_component[start : start + count]
+            local_idx = np.searchsorted(members, target_idx[in_comp])
+            target_dist[np.ix_(in_comp, in_comp)] = dijkstra(
+                adj[members][:, members], directed=False, indices=local_idx
+            )[:, local_idx]
+
+        src, dest = np.triu_indices(target_nodes.shape[0], k=1)
+        dist = target_dist[src, dest]
+        reachable = dist < np.inf
+
+        return np.stack(
+            (
+                target_nodes[src[reachable]],
+                target_nodes[dest[reachable]],
+                dist[reachable],
+            ),
+            axis=1,
+        )
 
     def _pagerank(self, target_publications):
         raise AbstractMethodError(self)
@@ -456,7 +791,53 @@ class Edge:
         raise AbstractMethodError(self)
 
     def _reset_index(self, node: str, old_indices: np.ndarray) -> None:
-        raise AbstractMethodError(self)
+        """Replace old IDs with condensed IDs for the given node.
+
+        When filtering / modifying a network, some nodes can get dropped
+        leading to gaps in the node indices. This replaces the old sparse IDs
+        with a dense set IDs (i.e. without any gaps). This should not be called
+        without also re-indexing the nodes.
+
+        Parameters
+        ----------
+        node : str
+          Which node to reindex
+        old_indices : np.ndarray
+          The full set of old indices. This differs from np.unique(self[node])
+          if there are nodes in the node dataframe without any edges in the
+          given edge set.
+
+        Raises
+        ------
+        ValueError
+          If an edge contains an ID that isn't in old_indices.
+
+        """
+        if len(self) == 0:
+            return
+
+        # When both columns are the same node type, they share the IDs.
+        columns = [node] if self.isbipartite else ["from", "to"]
+        ids = [self[col] for col in columns]
+        if old_indices.shape[0] == 0:
+            old_indices = np.concatenate(ids)
+
+        # A node's new ID is its position in the sorted old IDs, so a binary
+        # search replaces building a lookup table as large as the largest ID.
+        uniq = np.unique(old_indices)
+        new_ids = []
+        for col_ids in ids:
+            col_new_ids = np.searchsorted(uniq, col_ids)
+            found = uniq[np.minimum(col_new_ids, uniq.shape[0] - 1)]
+            if (found != col_ids).any():
+                raise ValueError(
+                    f"One or more edges contain a {node}ID not in {node}'s "
+                    + "node table. This may be a pubnet bug."
+                )
+            new_ids.append(col_new_ids)
+
+        for col, col_new_ids in zip(columns, new_ids):
+            self._renumber_column(col, col_new_ids)
 
 
 class AbstractMethodError(NotImplementedError):
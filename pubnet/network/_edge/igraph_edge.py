@@ -1,10 +1,10 @@
 """Implementation of the Edge class storing edges in a compressed form."""
 
+from typing import Any
+
 import igraph as ig
 import numpy as np
-from numpy.typing import ArrayLike, NDArray
-
-from pubnet.network._utils import edge_key
+from numpy.typing import NDArray
 
 from ._base import Edge
 
@@ -22,8 +22,23 @@ class IgraphEdge(Edge):
         if isinstance(new_data, ig.Graph):
             self._data = new_data
         else:
+            if isinstance(new_data, np.ndarray):
+                # igraph reads nested lists of python ints in bulk but has to
+                # convert numpy scalars one at a time.
+                new_data = new_data.tolist()
+
             self._data = ig.Graph(new_data, directed=True)
 
+        # Edges are only modified through `set_data` so the count and edge
+        # list can be cached instead of asking igraph on every access.
+        self._n_edges = self._data.ecount()
+        self._clear_cache()
+
+    def _clear_cache(self) -> None:
+        super()._clear_cache()
+        self._edgelist_cache: NDArray[Any] | None = None
+        self._feature_cache: dict[str, NDArray[Any]] = {}
+
     def __getitem__(self, key):
         row, col = self._parse_key(key)
 
@@ -39,36 +54,31 @@ class IgraphEdge(Edge):
             col = None if start == 0 and stop == 2 else start
 
         if self._is_mask(row):
-            row = np.arange(len(self))[row]
+            row = np.flatnonzero(row)
+
+            if col is None:
+                # Mask indices are sorted so the subgraph keeps the edge
+                # order, and igraph carries the features over itself.
+                return IgraphEdge(
+                    self._data.subgraph_edges(row, delete_vertices=False),
+                    self.name,
+                    self.start_id,
+                    self.end_id,
+                    self.dtype,
+                )
 
         if (row is None) and isinstance(col, int):
-            if col == 0:
-                res = (eid.source for eid in self._data.es.select())
-            else:
-                res = (eid.target for eid in self._data.es.select())
-
-            return np.fromiter(res, dtype=self.dtype)
-
-        if isinstance(row, int) and (col is not None):
-            if col == 0:
-                return self._data.es[row].source
-
-            return self._data.es[row].target
+            return self._edges()[:, col]
 
         if col is not None:
-            if col == 0:
-                res = (eid.source for eid in self._data.es[row].select())
-            else:
-                res = (eid.target for eid in self._data.es[row].select())
-
-            return np.fromiter(res, dtype=self.dtype)
+            return self._edges()[row, col]
 
         if isinstance(row, int):
-            return (self._data.es[row].source, self._data.es[row].target)
+            return tuple(self._edges()[row].tolist())
 
         feats = {f: self.feature_vector(f)[row] for f in self.features()}
         return IgraphEdge(
-            ((eid.source, eid.target) for eid in self._data.es[row].select()),
+            self._edges()[row],
             self.name,
             self.start_id,
             self.end_id,
@@ -76,84 +86,45 @@ class IgraphEdge(Edge):
             features=feats,
         )
 
-    def _is_mask(self, arr):
-        if not isinstance(arr, np.ndarray):
-            return False
-
-        if not isinstance(arr[0], np.bool_):
-            return False
-
-        if arr.shape[0] != len(self):
-            raise KeyError(
-                "Boolean mask must have same size as edge set for indexing"
-            )
-
-        return True
+    def __next__(self):
+        # Rows are tuples, matching `__getitem__` with an int row.
+        return tuple(super().__next__().tolist())
 
     def __len__(self) -> int:
-        return self._data.ecount()
+        return self._n_edges
 
     def __contains__(self, item: int) -> bool:
-        try:
-            node = list(self._data.vs.select(item))[0]
-        except ValueError:
+        # Vertex IDs are node IDs so membership is a degree lookup instead
+        # of selecting the vertex and listing its edges.
+        if not 0 <= item < self._data.vcount():
             return False
 
-        return len(node.all_edges()) > 0
+        return self._data.degree(item) > 0
 
-    def isin(
-        self, column: str | int, test_elements: ArrayLike
-    ) -> NDArray[np.bool_]:
-        """Find which elements from column are in the set of test_elements."""
-        return np.isin(
-            np.fromiter(self[:, column], dtype=self.dtype), test_elements
-        )
-
-    def isequal(self, other: Edge):
-        """Determine if two edge sets are equivalent."""
-        return self._data.get_edgelist() == other._data.get_edgelist()
-
-    def _to_binary(self, file_name, header_name, header):
-        self._data.write_pickle(fname=file_name)
-        with open(header_name, "wt") as header_file:
-            header_file.write(header)
-
-    def _to_tsv(self, file_name, header):
-        np.savetxt(
-            file_name,
-            self.as_array(),
-            delimiter="\t",
-            header=header,
-            comments="",
-        )
-
-    def _reset_index(self, node: str, old_indices: np.ndarray) -> None:
-        # TODO: Does not handle case where both node types are the same.
-        # i.e. non bipartite case.
-        if len(self[node]) == 0:
-            return
+    def _renumber_column(self, col: str, new_ids: NDArray[Any]) -> None:
+        # igraph edges can't be modified in place so renumber a copy of the
+        # edge list then rebuild the graph from it in one go.
+        edges = self.get_edgelist()
+        edges[:, self._column_to_indices(col)[0]] = new_ids
 
-        if old_indices.shape[0] == 0:
-            old_indices = np.unique(self[node])
+        feats = {f: self.feature_vector(f) for f in self.features()}
+        self.set_data(edges)
+        for name, feat in feats.items():
+            self.add_feature(feat, name)
 
-        uniq = np.unique(old_indices)
-        index_map = np.zeros((uniq.max() + 1,)) - 1
-        for i, index in enumerate(uniq):
-            index_map[index] = i
+    def _edges(self) -> NDArray[Any]:
+        """Return a read-only edge list shared until the edges change."""
+        if self._edgelist_cache is None:
+            edges: NDArray[Any] = np.asarray(
+                self._data.get_edgelist(), dtype=self.dtype
+            ).reshape((-1, 2))
+            edges.setflags(write=False)
+            self._edgelist_cache = edges
 
-        self[node][:] = index_map[self[node]]
-
-        if (self[node] == -1).any():
-            RuntimeWarning(
-                f"One or more edges contain a {node}ID not in {node}'s "
-                + "node table. This may be a pubnet bug. Missing IDs replaced "
-                + "with -1s. This may cause unintended behavior."
-            )
-
-        self._data = ig.Graph(self.get_edgelist(), directed=self.isdirected)
+        return self._edgelist_cache
 
     def get_edgelist(self):
-        return np.asarray(self._data.get_edgelist())
+        return self._edges().copy()
 
     def as_igraph(self):
         return self._data.copy()
@@ -164,39 +135,29 @@ class IgraphEdge(Edge):
 
     def feature_vector(self, name):
         self._assert_has_feature(name)
-        return self._data.es[name]
+        # Reading an attribute from igraph copies it into a new list, keep
+        # the converted array until the feature is replaced.
+        if name not in self._feature_cache:
+            feature = np.asarray(self._data.es[name])
+            feature.setflags(write=False)
+            self._feature_cache[name] = feature
+
+        return self._feature_cache[name]
 
     def add_feature(self, feature, name):
         """Add a new feature to the edge."""
         if name in self.features():
             raise KeyError(f"{name} is already a feature.")
 
-        self._data.es[name] = feature
+        if isinstance(feature, np.ndarray):
+            # Write python scalars in one bulk assignment, otherwise igraph
+            # stores a boxed numpy scalar per edge.
+            feature = feature.tolist()
 
-    def overlap(self, node_type, weights=None):
-        es = []
-        ovr = []
-        nodes = list(set(self[:, node_type]))
-        mode = "out" if node_type == self.start_id else "in"
-
-        for i, ni in enumerate(nodes):
-            first_node_neighbors = set(self._data.neighbors(ni, mode=mode))
-            for nj in nodes[i + 1 :]:
-                second_node_neighbors = set(self._data.neighbors(nj))
-
-                n_common = len(
-                    first_node_neighbors.intersection(second_node_neighbors)
-                )
-                if n_common != 0:
-                    es.append((ni, nj))
-                    ovr.append(n_common)
+        self._data.es[name] = feature
 
-        new_edge = ig.Graph(es, directed=False)
-        new_edge.es["overlap"] = ovr
-        return IgraphEdge(
-            new_edge,
-            edge_key(node_type, f"{self.other_node(node_type)}Overlap"),
-            start_id=node_type,
-            end_id=node_type,
-            dtype=self.dtype,
-        )
+    def drop_feature(self, name):
+        if name in self.features():
+            del self._data.es[name]
+            self._feature_cache.pop(name, None)
+            self._adjacency_cache.clear()
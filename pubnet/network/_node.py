@@ -18,6 +18,67 @@ from pubnet.network._utils import (
 __all__ = ["Node"]
 
 
+def _arrow_read_tsv(file_name: str) -> pd.DataFrame | None:
+    """Read a node table with pyarrow's multithreaded csv reader.
+
+    Returns None if pyarrow isn't installed or can't parse the file, in which
+    case the caller should fall back to pandas. Compression is inferred from
+    the file name's extension.
+    """
+    try:
+        import pyarrow as pa
+        from pyarrow import csv
+    except ImportError:
+        return None
+
+    # Open the file once, mapping it when it isn't compressed, so sniffing
+    # the header and parsing the table share the same bytes.
+    if str(file_name).endswith(".gz"):
+        with pa.input_stream(file_name, compression="gzip") as f:
+            source = f.read_buffer()
+    else:
+        with pa.memory_map(str(file_name)) as f:
+            source = f.read_buffer()
+
+    # Quoting is off for the same reason as the pandas reader in
+    # `Node.from_file`.
+    parse_options = csv.ParseOptions(delimiter="\t", quote_char=False)
+    try:
+        # pyarrow parses dates and times but pandas leaves them as strings.
+        # Keep them as strings so the result doesn't depend on the reader.
+        # Only the first block is parsed to infer the header's types.
+        with csv.open_csv(
+            pa.BufferReader(source), parse_options=parse_options
+        ) as reader:
+            as_strings = {
+                field.name: pa.string()
+                for field in reader.schema
+                if pa.types.is_temporal(field.type)
+            }
+
+        table = csv.read_csv(
+            pa.BufferReader(source),
+            parse_options=parse_options,
+            convert_options=csv.ConvertOptions(
+                column_types=as_strings, strings_can_be_null=True
+            ),
+        )
+    except pa.ArrowInvalid:
+        # pyarrow rejects rows with missing fields, pandas fills them in.
+        return None
+
+    data = table.to_pandas()
+    # pyarrow marks missing strings with None where pandas uses NaN. Numeric
+    # columns already use NaN so only replace in columns that need it.
+    for field, column in zip(table.schema, table.columns):
+        if column.null_count > 0 and not (
+            pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+        ):
+            data[field.name] = data[field.name].fillna(np.nan)
+
+    return data.set_index(data.columns[0])
+
+
 class Node:
     """Class for storing node data for PubNet class.
 
@@ -93,7 +154,7 @@ class Node:
             return gen_node(self._data[key])
 
         if isinstance(key, int):
-            return gen_node(self._data[self._data.columns[key]])
+            return gen_node(self._data.iloc[:, key])
 
         if isinstance(key, tuple):
             assert (
@@ -109,7 +170,7 @@ class Node:
             columns = slice(None)
 
         if isinstance(columns, int):
-            new_data = self._data[self._data.columns[columns]]
+            new_data = self._data.iloc[:, columns]
         else:
             new_data = self._data
 
@@ -117,12 +178,10 @@ class Node:
             return gen_node(new_data[rows : (rows + 1)])
 
         if not isinstance(rows, slice):
-            if isinstance(rows, pd.Series):
-                is_mask = isinstance(rows.values[0], (bool, np.bool_))
-            else:
-                is_mask = isinstance(rows[0], (bool, np.bool_))
-
-            if is_mask:
+            # Check the dtype instead of the first element so empty keys work
+            # and arrays and series aren't indexed just to inspect them.
+            dtype = getattr(rows, "dtype", None) or np.asarray(rows).dtype
+            if dtype.kind == "b":
                 return gen_node(new_data.loc[rows])
 
         return gen_node(new_data[rows])
@@ -212,20 +271,11 @@ class Node:
         return self._data.iloc[rng.integers(0, self._data.shape[0], size=(n,))]
 
     def isequal(self, node_2):
-        """Test if two `Node`s have the same values in all their columns."""
-        if not (self.features == node_2.features).all():
-            return False
-
-        for feature in self.features:
-            filled_self = self._data[feature].notna()
-            filled_other = node_2._data[feature].notna()
-            if not (
-                self._data[feature][filled_self].array
-                == node_2._data[feature][filled_other].array
-            ).all():
-                return False
-
-        return True
+        """Test if two `Node`s have the same index, dtypes and values."""
+        # Compares the features and every column in one pass, stopping at the
+        # first mismatch, and treats missing values in the same positions as
+        # equal.
+        return self._data.equals(node_2._data)
 
     def to_file(
         self,
@@ -312,9 +362,14 @@ class Node:
             #
             # This could however be an issue for data from other sources.
             # Revisit as needed.
-            data = pd.read_table(
-                file_name, index_col=0, memory_map=True, quoting=QUOTE_NONE
-            )
+            data = _arrow_read_tsv(file_name)
+            if data is None:
+                data = pd.read_table(
+                    file_name,
+                    index_col=0,
+                    memory_map=True,
+                    quoting=QUOTE_NONE,
+                )
             # Prefer name in header to that in filename if available (but they
             # *should* be the same).
             node_id, name = node_id_label_parts(data.index.name)
@@ -1,7 +1,12 @@
 """Helper functions for writing publication network functions."""
 
+import locale
 import os
 import re
+from collections import defaultdict
+from contextlib import suppress
+from functools import cache
+from itertools import combinations_with_replacement
 from typing import Sequence, cast
 
 __all__ = [
@@ -23,16 +28,21 @@ __all__ = [
 ]
 
 NODE_PATH_REGEX = re.compile(r"(?P<node>\w+)_nodes.(?P<ext>[\w\.]+)")
+RELATIONAL_NODE_PATH_REGEX = re.compile(r"(\w*)_(\w*)_nodes.tsv")
+NODE_ID_LABEL_REGEX = re.compile(r"(?P<name>\w+):ID\((?P<namespace>\w+)\)")
 EDGE_PATH_REGEX = re.compile(r"(?P<n1>\w+)_(?P<n2>\w+)_edges.(?P<ext>[\w\.]+)")
+EDGE_HEADER_REGEX = re.compile(
+    r":(?P<position>START|END)_ID\((?P<node>\w+)\)|(?P<feature>[\w:()]+)"
+)
 EDGE_KEY_DELIM = "-"
 
 
 def is_node_file(file_name: str) -> bool:
-    return re.search(NODE_PATH_REGEX, file_name) is not None
+    return NODE_PATH_REGEX.search(file_name) is not None
 
 
 def is_edge_file(file_name: str) -> bool:
-    return re.search(EDGE_PATH_REGEX, file_name) is not None
+    return EDGE_PATH_REGEX.search(file_name) is not None
 
 
 def edge_key(node_1: str, node_2: str) -> str:
@@ -88,7 +98,7 @@ def edge_file_parts(file_name: str) -> tuple[str, str]:
         The name of the file.
 
     """
-    name_matches = re.search(EDGE_PATH_REGEX, file_name)
+    name_matches = EDGE_PATH_REGEX.search(file_name)
 
     if name_matches is None:
         raise NameError("File name does not match naming conventions.")
@@ -109,7 +119,7 @@ def node_file_parts(file_name: str):
         The name of the file.
 
     """
-    name_parts = re.search(NODE_PATH_REGEX, file_name)
+    name_parts = NODE_PATH_REGEX.search(file_name)
 
     if name_parts is None:
         raise NameError("File name does not match naming conventions.")
@@ -131,7 +141,9 @@ def edge_gen_file_name(edge: str, ext: str, data_dir: str) -> tuple[str, str]:
 
 
 def node_list_files(
-    graph_dir: str, nodes: list[str] | None = None
+    graph_dir: str,
+    nodes: list[str] | None = None,
+    files: list[str] | None = None,
 ) -> list[str]:
     """Return preferred node files in the graph_dir.
 
@@ -142,6 +154,9 @@ def node_list_files(
 
     If nodes is provided, only return files for the nodes in the list.
     Otherwise, return all node files.
+
+    If files is provided, it is used as the listing of graph_dir instead of
+    reading the directory again.
     """
 
     def node_find_file(
@@ -164,18 +179,17 @@ def node_list_files(
             f'No file found for node "{node}" with a supported file extension.'
         )
 
-    files = os.listdir(graph_dir)
-    node_files = [
-        (m.groupdict(), os.path.join(graph_dir, m.group()))
-        for m in (re.search(NODE_PATH_REGEX, f) for f in files)
-        if m is not None
-    ]
-    nodes = nodes or list({n[0]["node"] for n in node_files})
-    path_dict: dict[str, dict[str, str]] = {}
-    for n in nodes:
-        path_dict[n] = {
-            f[0]["ext"]: f[1] for f in node_files if f[0]["node"] == n
-        }
+    # Group files by node and extension in a single pass over the directory.
+    node_files: defaultdict[str, dict[str, str]] = defaultdict(dict)
+    files = os.listdir(graph_dir) if files is None else files
+    for m in (NODE_PATH_REGEX.search(f) for f in files):
+        if m is not None:
+            node_files[m["node"]][m["ext"]] = os.path.join(
+                graph_dir, m.group()
+            )
+
+    nodes = nodes or list(node_files)
+    path_dict = {n: node_files.get(n, {}) for n in nodes}
     return [
         file
         for file in (node_find_file(n, path_dict) for n in path_dict)
@@ -186,11 +200,15 @@ def node_list_files(
 def edge_list_files(
     graph_dir: str,
     nodes: tuple[tuple[str, str], ...] | tuple[str, ...] | None = None,
+    files: list[str] | None = None,
 ) -> list[str]:
     """List all edge files in graph.
 
     If nodes is provided, only return edges between node types that are both in
     nodes list.
+
+    If files is provided, it is used as the listing of graph_dir instead of
+    reading the directory again.
     """
 
     def edge_find_file(
@@ -236,12 +254,12 @@ def edge_list_files(
         if not nodes:
             edges = tuple(edge_files.keys())
         elif isinstance(nodes[0], str):
-            edges = tuple(
+            # Key each pair once, dropping repeats while keeping the order.
+            candidates = dict.fromkeys(
                 edge_key(n1, n2)  # type: ignore[arg-type]
-                for i, n1 in enumerate(nodes)
-                for n2 in nodes[i:]
-                if edge_key(n1, n2) in edge_files  # type: ignore[arg-type]
+                for n1, n2 in combinations_with_replacement(nodes, 2)
             )
+            edges = tuple(e for e in candidates if e in edge_files)
         else:
             edges = tuple(
                 edge_key(e[0], e[1])
@@ -251,22 +269,16 @@ def edge_list_files(
 
         return [edge_find_file(*edge_parts(e), edge_files) for e in edges]
 
-    files = os.listdir(graph_dir)
-    edge_files = [
-        (m.groupdict(), os.path.join(graph_dir, m.group()))
-        for m in (re.search(EDGE_PATH_REGEX, f) for f in files)
-        if m is not None
-    ]
-    edges = {edge_key(e[0]["n1"], e[0]["n2"]) for e in edge_files}
-    path_dict: dict[str, dict[str, str]] = {}
-    for e in edges:
-        path_dict[e] = {
-            f[0]["ext"]: f[1]
-            for f in edge_files
-            if edge_key(f[0]["n1"], f[0]["n2"]) == e
-        }
+    # Group files by edge and extension in a single pass over the directory.
+    path_dict: defaultdict[str, dict[str, str]] = defaultdict(dict)
+    files = os.listdir(graph_dir) if files is None else files
+    for m in (EDGE_PATH_REGEX.search(f) for f in files):
+        if m is not None:
+            path_dict[edge_key(m["n1"], m["n2"])][m["ext"]] = os.path.join(
+                graph_dir, m.group()
+            )
 
-    return edge_files_containing(nodes, path_dict)
+    return edge_files_containing(nodes, dict(path_dict))
 
 
 def node_gen_id_label(name: str, namespace: str) -> str:
@@ -274,8 +286,7 @@ def node_gen_id_label(name: str, namespace: str) -> str:
 
 
 def node_id_label_parts(label: str) -> tuple[str, str]:
-    pattern = r"(?P<name>\w+):ID\((?P<namespace>\w+)\)"
-    match = re.search(pattern, label)
+    match = NODE_ID_LABEL_REGEX.search(label)
 
     if match is None:
         raise ValueError(f"{label} does not match label naming convention.")
@@ -307,23 +318,20 @@ def edge_header_parts(
         The indices to sort columns into start id, end id, *features
 
     """
-    ids = re.findall(r":((?:START)|(?:END))_ID\((\w+)\)", header)
-    for idx, (position, node) in enumerate(ids):
-        if position == "START":
-            start_id: str = node
+    features: list[str] = []
+    feature_indices: list[int] = []
+    for idx, column in enumerate(EDGE_HEADER_REGEX.finditer(header)):
+        if column["feature"] is not None:
+            features.append(column["feature"])
+            feature_indices.append(idx)
+        elif column["position"] == "START":
+            start_id: str = column["node"]
             start_idx = idx
-        elif position == "END":
-            end_id: str = node
+        else:
+            end_id: str = column["node"]
             end_idx = idx
 
-    features: list[str] = [
-        feat
-        for feat in re.findall(r"([\w:()]+)", header)
-        if not (feat.startswith(":START") or feat.startswith(":END"))
-    ]
-    col_indices = (start_idx, end_idx) + tuple(
-        i for i in range(len(features) + 2) if i not in (start_idx, end_idx)
-    )
+    col_indices = (start_idx, end_idx) + tuple(feature_indices)
 
     return (start_id, end_id, features, col_indices)
 
@@ -365,7 +373,7 @@ def select_graph_components(
 
         return tuple(
             e.groups()[0:2]
-            for e in (re.search(EDGE_PATH_REGEX, f) for f in files)
+            for e in (EDGE_PATH_REGEX.search(f) for f in files)
             if (e is not None) and (n1 in e.groups()[0:2])
         )
 
@@ -374,7 +382,7 @@ def select_graph_components(
         # ({parent_node}_{child_node}.tsv).
         all_relational_nodes = [
             m.groups()
-            for m in (re.search(r"(\w*)_(\w*)_nodes.tsv", f) for f in files)
+            for m in (RELATIONAL_NODE_PATH_REGEX.search(f) for f in files)
             if m is not None
         ]
         relational_nodes = {
@@ -392,6 +400,7 @@ def select_graph_components(
         }
         return tuple(relational_nodes.union(regular_nodes))
 
+    # List the directory once and share it with the file finders below.
     files = os.listdir(graph_dir)
 
     if edges != "all":
@@ -401,15 +410,27 @@ def select_graph_components(
         nodes = collect_nodes(edges, files)
 
     if edges != "all":
-        edge_files = edge_list_files(graph_dir, edges)
+        edge_files = edge_list_files(graph_dir, edges, files=files)
     elif nodes == "all":
-        edge_files = edge_list_files(graph_dir)
+        edge_files = edge_list_files(graph_dir, files=files)
     else:
-        edge_files = edge_list_files(graph_dir, nodes)
+        edge_files = edge_list_files(graph_dir, nodes, files=files)
 
     if nodes == "all":
-        node_files = node_list_files(graph_dir)
+        node_files = node_list_files(graph_dir, files=files)
     else:
-        node_files = node_list_files(graph_dir, nodes)
+        node_files = node_list_files(graph_dir, nodes, files=files)
 
     return (node_files, edge_files)
+
+
+@cache
+def set_user_locale() -> None:
+    """Switch to the user's preferred locale for number formatting.
+
+    `setlocale` modifies process wide state so only call it the first time
+    it's needed instead of every time an object is printed. If the user's
+    locale isn't supported, the current locale is kept instead of raising.
+    """
+    with suppress(locale.Error):
+        locale.setlocale(locale.LC_ALL, "")
@@ -181,28 +181,32 @@ def _dir_exists(path: str) -> bool:
     """Test if provided path exists and is not empty.
 
     default directory commands create a directory so the directory may exist
-    even if it's unused (empty). If empty delete and return non-existent.
+    even if it's unused (empty), in which case it's treated as non-existent.
+    Only reads the first entry and leaves the directory untouched.
     """
     try:
-        os.rmdir(path)
-    except OSError:
-        return True
-
-    return False
+        with os.scandir(path) as entries:
+            return next(entries, None) is not None
+    except (FileNotFoundError, NotADirectoryError):
+        return False
 
 
 def _clear_dir(path: str) -> None:
     if not _dir_exists(path):
         raise NotADirectoryError("Path does not exist")
 
-    for f_name in os.listdir(path):
-        f_path = os.path.join(path, f_name)
-        if os.path.isdir(f_path):
-            _clear_dir(f_path)
-        else:
-            os.unlink(f_path)
+    def delete_tree(path):
+        # Directory entries cache their type so no extra stat per file.
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    delete_tree(entry.path)
+                else:
+                    os.unlink(entry.path)
 
-    os.rmdir(path)
+        os.rmdir(path)
+
+    delete_tree(path)
 
 
 def clear_cache(path: str = "") -> None:
@@ -240,20 +244,25 @@ def list_graphs(data_dir: Optional[str] = None) -> List[str]:
     if not data_dir:
         data_dir = default_data_dir()
 
-    return [
-        d
-        for d in os.listdir(data_dir)
-        if (os.path.isdir(graph_path(d, data_dir)))
-        and (os.listdir(graph_path(d, data_dir)))  # Exclude empty dirs
-    ]
+    def is_empty(path: str) -> bool:
+        with os.scandir(path) as entries:
+            return next(entries, None) is None
+
+    with os.scandir(data_dir) as entries:
+        return [
+            entry.name
+            for entry in entries
+            if entry.is_dir() and not is_empty(entry.path)
+        ]
 
 
 def delete_graph(name: str, data_dir: Optional[str] = None) -> None:
     """Delete the graph from `data_dir`."""
 
     def delete_directory(path):
-        for f in os.listdir(path):
-            os.unlink(os.path.join(path, f))
+        with os.scandir(path) as entries:
+            for entry in entries:
+                os.unlink(entry.path)
         os.rmdir(path)
 
     path = graph_path(name, data_dir)
@@ -1,6 +1,14 @@
+import gzip
+import sys
+from csv import QUOTE_NONE
+
+import numpy as np
+import pandas as pd
 import pytest
 
 from pubnet import PubNet
+from pubnet.network._node import Node, _arrow_read_tsv
+from pubnet.storage import _dir_exists
 
 from ._test_fixtures import simple_pubnet
 
@@ -29,6 +37,7 @@ class TestIO:
         assert simple_pubnet.get_edge("Author", "Publication").isequal(
             new.get_edge("Author", "Publication")
         )
+        assert new.get_edge("Author", "Publication").dtype == np.int32
 
     @pytest.mark.parametrize("file_format", ["tsv", "gzip", "binary"])
     def test_node_io(self, simple_pubnet, tmp_path, file_format):
@@ -90,3 +99,93 @@ class TestIO:
         assert simple_pubnet.get_edge("Publication", "AuthorOverlap").isequal(
             new.get_edge("Publication", "AuthorOverlap")
         )
+
+    @pytest.mark.parametrize("file_format", ["tsv", "gzip"])
+    def test_tsv_writers_agree(
+        self, simple_pubnet, tmp_path, monkeypatch, file_format
+    ):
+        pytest.importorskip("pyarrow")
+        edge = simple_pubnet.get_edge("Author", "Publication")
+        overlap = edge.overlap("Publication", weights=np.full(len(edge), 0.5))
+        overlap.add_feature(np.linspace(1e-5, 1e16, len(overlap)), "spread")
+        simple_pubnet.add_edge(overlap)
+
+        def write(name):
+            simple_pubnet.save_graph(
+                name,
+                nodes=None,
+                edges=(("Publication", "AuthorOverlap"),),
+                data_dir=tmp_path,
+                file_format=file_format,
+            )
+            (path,) = (tmp_path / name).iterdir()
+            with (
+                gzip.open(path) if file_format == "gzip" else open(path, "rb")
+            ) as f:
+                return f.read()
+
+        with_arrow = write("arrow")
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        with_pandas = write("pandas")
+
+        assert with_arrow == with_pandas
+        assert b"\t0.25\t" in with_arrow
+
+        new = PubNet.load_graph("pandas", data_dir=tmp_path).get_edge(
+            "Publication", "AuthorOverlap"
+        )
+        assert overlap.isequal(new)
+        for feature in ("overlap", "spread"):
+            assert np.array_equal(
+                new.feature_vector(feature), overlap.feature_vector(feature)
+            )
+
+    def test_arrow_node_reader_matches_pandas(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        file_name = tmp_path / "Author_nodes.tsv"
+        file_name.write_text(
+            "AuthorId:ID(Author)\tName\tScore\tDate\n"
+            "0\tAda\t0.5\t2020-01-31\n"
+            "1\t\t1.25\t2021-06-01\n"
+            "2\tGrace\t2.0\t2022-12-24\n"
+        )
+
+        data = _arrow_read_tsv(file_name)
+        expected = pd.read_table(file_name, index_col=0, quoting=QUOTE_NONE)
+
+        assert data["Date"].tolist() == expected["Date"].tolist()
+        pd.testing.assert_frame_equal(data, expected)
+
+    def test_arrow_node_reader_falls_back_on_short_rows(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        file_name = tmp_path / "Author_nodes.tsv"
+        file_name.write_text(
+            "AuthorId:ID(Author)\tName\tScore\n0\tAda\t1\n1\tGrace\n"
+        )
+
+        assert _arrow_read_tsv(file_name) is None
+
+        node = Node.from_file(str(file_name))
+        assert node.shape == (2, 2)
+        assert np.isnan(node.feature_vector("Score")[1])
+
+    def test_arrow_node_reader_without_pyarrow(self, tmp_path, monkeypatch):
+        file_name = tmp_path / "Author_nodes.tsv"
+        file_name.write_text("AuthorId:ID(Author)\tName\n0\tAda\n")
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+        assert _arrow_read_tsv(file_name) is None
+
+    def test_dir_exists(self, tmp_path):
+        assert not _dir_exists(tmp_path / "missing")
+
+        empty = tmp_path / "empty"
+        empty.mkdir()
+        assert not _dir_exists(empty)
+        assert empty.is_dir()
+
+        full = tmp_path / "full"
+        full.mkdir()
+        (full / "Author_nodes.tsv").write_text("AuthorId:ID(Author)\n")
+        assert _dir_exists(full)
+        assert not _dir_exists(full / "Author_nodes.tsv")
@@ -1,11 +1,13 @@
-import time
-
 import numpy as np
 import pandas as pd
 import pytest
+import scipy.sparse as sp
+from scipy.sparse.csgraph import dijkstra
 
 import pubnet
 from pubnet import PubNet
+from pubnet.network import _edge
+from pubnet.network._node import Node
 
 from ._test_fixtures import author_node, other_pubnet, simple_pubnet
 
@@ -64,6 +66,313 @@ class TestEdges:
         )
         assert np.array_equal(actual, expected)
 
+    def test_sparse_matrix_is_not_shared(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        expected = edges.overlap("Publication").as_array()
+
+        mat = edges.to_sparse_matrix(row="Publication")
+        mat.data *= 10
+
+        assert np.array_equal(
+            edges.overlap("Publication").as_array(), expected
+        )
+        assert (edges.to_sparse_matrix(row="Publication").data == 1).all()
+
+    def test_sparse_matrix_follows_set_data(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        edges.to_sparse_matrix(row="Publication")
+        edges.set_data(edges.get_edgelist()[:3])
+
+        assert edges.to_sparse_matrix(row="Publication").sum() == 3
+
+    def test_sparse_matrix_follows_features(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        n_edges = len(edges)
+        edges.add_feature(np.ones(n_edges, dtype=int), "weight")
+        mat = edges.to_sparse_matrix(row="Publication", weights="weight")
+        assert mat.sum() == n_edges
+
+        edges.drop_feature("weight")
+        edges.add_feature(np.full(n_edges, 2), "weight")
+        mat = edges.to_sparse_matrix(row="Publication", weights="weight")
+        assert mat.sum() == 2 * n_edges
+
+    def test_caches_rebuilt_after_set_data(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        edges.add_feature(np.arange(len(edges)), "order")
+        edges.feature_vector("order")
+        edges.to_sparse_matrix(row="Publication")
+        original = edges.get_edgelist().copy()
+
+        edges.set_data(original[::-1])
+
+        assert np.array_equal(edges.get_edgelist(), original[::-1])
+        assert edges.to_sparse_matrix(row="Publication").sum() == len(original)
+        assert (
+            edges.overlap("Publication").feature_vector("overlap") > 0
+        ).all()
+
+    def test_feature_cache_rebuilt_after_drop(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        edges.add_feature(np.arange(len(edges)), "order")
+        assert edges.feature_vector("order")[-1] == len(edges) - 1
+
+        edges.drop_feature("order")
+        assert "order" not in edges.features()
+
+        edges.add_feature(np.zeros(len(edges), dtype=int), "order")
+        assert (np.asarray(edges.feature_vector("order")) == 0).all()
+
+    def test_feature_vector_is_read_only(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        edges.add_feature(np.ones(len(edges), dtype=int), "weight")
+        expected = edges.to_sparse_matrix(row="Author", weights="weight")
+
+        with pytest.raises(ValueError, match="read-only"):
+            edges.feature_vector("weight")[:] = 2
+
+        assert (
+            edges._sparse_matrix(row="Author", weights="weight") != expected
+        ).nnz == 0
+
+    def test_float_weights_kept(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        weights = np.full(len(edges), 0.5)
+        edges.add_feature(weights, "weight")
+
+        for w in (weights, "weight"):
+            mat = edges.to_sparse_matrix(row="Publication", weights=w)
+            assert mat.dtype == np.float64
+            assert mat.sum() == pytest.approx(0.5 * len(edges))
+
+    def test_weighted_overlap(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        expected = np.asarray(
+            edges.overlap("Publication").feature_vector("overlap")
+        )
+        weighted = edges.overlap(
+            "Publication", weights=np.full(len(edges), 0.5)
+        )
+
+        assert np.allclose(weighted.feature_vector("overlap"), expected / 4)
+
+    @pytest.mark.parametrize("representation", ["numpy", "igraph"])
+    def test_shortest_path_disconnected(self, representation):
+        # Start nodes 0--2 and 5--6 form two overlap components and 8 has no
+        # overlap at all.
+        data = np.array(
+            [
+                [0, 10],
+                [1, 10],
+                [1, 11],
+                [2, 11],
+                [0, 12],
+                [1, 12],
+                [5, 20],
+                [6, 20],
+                [8, 30],
+            ]
+        )
+        edges = _edge.from_data(
+            data, start_id="A", end_id="B", representation=representation
+        )
+        targets = np.array([0, 2, 5, 6, 8, 99])
+
+        similarity = edges.similarity(targets, "shortest_path")
+
+        overlap = edges.overlap("A")
+        pairs = overlap.get_edgelist()
+        weights = 1 / np.asarray(
+            overlap.feature_vector("overlap"), dtype=float
+        )
+        n_nodes = data[:, 0].max() + 1
+        sources = targets[targets < n_nodes]
+        distances = dijkstra(
+            sp.csr_matrix(
+                (weights, (pairs[:, 0], pairs[:, 1])), shape=(n_nodes,) * 2
+            ),
+            directed=False,
+            indices=sources,
+        )
+        expected = [
+            (src, dest, distances[i, dest])
+            for i, src in enumerate(sources)
+            for dest in sources[i + 1 :]
+            if np.isfinite(distances[i, dest])
+        ]
+
+        assert [(src, dest) for src, dest, _ in expected] == [(0, 2), (5, 6)]
+        assert np.allclose(similarity, expected)
+
+    def test_mask_keeps_features(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        edges.add_feature(np.arange(len(edges)), "order")
+        mask = np.arange(len(edges)) % 2 == 0
+
+        subset = edges[mask]
+
+        assert np.array_equal(
+            subset.get_edgelist(), edges.get_edgelist()[mask]
+        )
+        assert np.array_equal(
+            subset.feature_vector("order"), np.flatnonzero(mask)
+        )
+
+    def test_all_false_mask(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        edges.add_feature(np.arange(len(edges)), "order")
+
+        subset = edges[np.zeros(len(edges), dtype=bool)]
+
+        assert len(subset) == 0
+        assert subset.get_edgelist().shape == (0, 2)
+        assert "order" in subset.features()
+
+    @pytest.mark.parametrize("size_change", [-1, 1])
+    def test_mask_length_must_match(self, simple_pubnet, size_change):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        mask = np.zeros(len(edges) + size_change, dtype=bool)
+        mask[0] = True
+
+        with pytest.raises(KeyError, match="same size"):
+            edges[mask]
+
+    def test_two_dimensional_mask(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        mask = np.ones((len(edges), 2), dtype=bool)
+
+        with pytest.raises(KeyError, match="one dimensional"):
+            edges[mask]
+
+    def test_integer_array_is_not_mask(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        rows = np.array([1, 0])
+
+        assert np.array_equal(
+            edges[rows].get_edgelist(), edges.get_edgelist()[rows]
+        )
+
+    @pytest.mark.parametrize("representation", ["numpy", "igraph"])
+    def test_contains(self, representation):
+        # Node 2 is below the largest ID but has no edges.
+        edges = _edge.from_data(
+            np.array([[0, 3], [1, 3]]),
+            start_id="A",
+            end_id="B",
+            representation=representation,
+        )
+
+        for node in (0, 1, 3):
+            assert node in edges
+        for node in (2, 4, -1, 2**40):
+            assert node not in edges
+
+    def test_contains_after_set_data(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        edgelist = edges.get_edgelist()
+        node = edgelist[0, 0]
+        assert node in edges
+
+        edges.set_data(edgelist[(edgelist != node).all(axis=1)])
+
+        assert node not in edges
+
+    def test_isin(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        edgelist = edges.get_edgelist()
+        author = edges["Author"][0]
+        publication = edges["Publication"][0]
+
+        for column, node, expected in (
+            ("Author", author, edges["Author"] == author),
+            ("Publication", publication, edges["Publication"] == publication),
+            (0, edgelist[0, 0], edgelist[:, 0] == edgelist[0, 0]),
+            (1, edgelist[0, 1], edgelist[:, 1] == edgelist[0, 1]),
+        ):
+            assert np.array_equal(edges.isin(column, [node]), expected)
+
+    def test_iteration(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        rows = list(edges)
+
+        assert len(rows) == len(edges)
+        assert tuple(rows[0]) == tuple(edges.get_edgelist()[0])
+        if edges.representation == "igraph":
+            assert isinstance(rows[0], tuple)
+
+        with pytest.raises(StopIteration):
+            next(edges)
+
+    def test_next_before_iter(self, simple_pubnet):
+        with pytest.raises(StopIteration):
+            next(simple_pubnet.get_edge("Author", "Publication"))
+
+    def test_rejects_misshaped_edge_data(self):
+        with pytest.raises(ValueError, match="shape"):
+            _edge.from_data(
+                np.arange(6).reshape((2, 3)), start_id="A", end_id="B"
+            )
+
+    def test_empty_edge_data(self):
+        edges = _edge.from_data(np.array([]), start_id="A", end_id="B")
+        assert len(edges) == 0
+        assert edges.get_edgelist().shape == (0, 2)
+
+    @pytest.mark.parametrize("representation", ["numpy", "igraph"])
+    def test_small_ids_use_int32(self, representation):
+        edges = _edge.from_data(
+            np.array([[0, 1], [2, 3]]),
+            start_id="A",
+            end_id="B",
+            representation=representation,
+        )
+        assert edges.dtype == np.int32
+        assert edges.get_edgelist().dtype == np.int32
+
+    def test_large_ids_use_int64(self):
+        edges = _edge.from_data(
+            np.array([[0, 1], [2**31, 3]]), start_id="A", end_id="B"
+        )
+        assert edges.dtype == np.int64
+        assert edges.get_edgelist()[1, 0] == 2**31
+
+    @pytest.mark.parametrize("representation", ["numpy", "igraph"])
+    def test_explicit_dtype_respected(self, representation):
+        edges = _edge.from_data(
+            np.array([[0, 1], [2, 3]]),
+            start_id="A",
+            end_id="B",
+            representation=representation,
+            dtype=np.int64,
+        )
+        assert edges.dtype == np.int64
+        assert edges.get_edgelist().dtype == np.int64
+
+    @pytest.mark.parametrize("representation", ["numpy", "igraph"])
+    def test_reset_index_rejects_missing_ids(self, representation):
+        edges = _edge.from_data(
+            np.array([[0, 5], [1, 6], [2, 7]]),
+            start_id="A",
+            end_id="B",
+            representation=representation,
+        )
+        with pytest.raises(ValueError, match="AID not in A's node table"):
+            edges._reset_index("A", np.array([0, 1]))
+
+        assert np.array_equal(edges["A"], [0, 1, 2])
+
+    @pytest.mark.parametrize("representation", ["numpy", "igraph"])
+    def test_reset_index_non_bipartite(self, representation):
+        edges = _edge.from_data(
+            np.array([[2, 8], [8, 4]]),
+            start_id="A",
+            end_id="A",
+            representation=representation,
+        )
+        edges._reset_index("A", np.array([2, 4, 6, 8]))
+
+        assert np.array_equal(edges.get_edgelist(), [[0, 3], [3, 1]])
+
 
 class TestNodes:
     def test_finds_namespace(self, author_node):
@@ -72,6 +381,19 @@ class TestNodes:
     def test_shape(self, author_node):
         assert author_node.shape == (4, 2)
 
+    def test_isequal(self):
+        data = pd.DataFrame({"Name": ["Ada", None], "Score": [1, 2]})
+        node = Node(data, "AuthorId", "Author")
+
+        assert node.isequal(Node(data.copy(), "AuthorId", "Author"))
+        assert not node.isequal(
+            Node(data.astype({"Score": float}), "AuthorId", "Author")
+        )
+        assert not node.isequal(
+            Node(data.set_axis([1, 2]), "AuthorId", "Author")
+        )
+        assert not node.isequal(Node(data[["Name"]], "AuthorId", "Author"))
+
     def test_slice_column(self, author_node):
         assert author_node.feature_vector("LastName")[0] == "Smith"
 
@@ -262,6 +584,22 @@ class TestNetwork:
             edges, simple_pubnet._edge_data.keys(), invert=True
         ).all()
 
+    def test_repack(self, simple_pubnet):
+        simple_pubnet.repack()
+        edges = simple_pubnet.get_edge("Author", "Publication")
+
+        assert np.array_equal(simple_pubnet.get_node("Author").index, range(4))
+        assert np.array_equal(np.unique(edges["Author"]), range(4))
+        assert np.array_equal(np.unique(edges["Publication"]), range(6))
+
+    def test_repack_keeps_features(self, simple_pubnet):
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        edges.add_feature(np.arange(len(edges)), "order")
+        simple_pubnet.repack()
+
+        edges = simple_pubnet.get_edge("Author", "Publication")
+        assert np.array_equal(edges.feature_vector("order"), range(len(edges)))
+
     @pytest.mark.filterwarnings(
         "ignore:Constructing PubNet object without Publication nodes."
     )
@@ -285,7 +623,6 @@ class TestNetwork:
         )
 
 
-@pytest.mark.skip("Modifying simialrity and overlap methods.")
 class TestSnapshots:
     """Ensure consistency between edge representations."""
 
@@ -305,25 +642,25 @@ class TestSnapshots:
         )
 
     @pytest.mark.parametrize("method", ["shortest_path"])
-    def test_repeated_overlap_calculations(self, simple_pubnet, method):
-        """Overlap is stored in a variable so subsequent runs should be quicker
-        than original run."""
+    def test_repeated_overlap_calculations(
+        self, simple_pubnet, method, monkeypatch
+    ):
+        """Overlap is stored in a variable so subsequent runs should reuse it
+        instead of recalculating it."""
 
         publication_ids = simple_pubnet.ids_containing(
             "Author", "LastName", "Smith"
         )
+        edges = simple_pubnet.get_edge("Author", "Publication")
 
-        t_start = time.time()
-        sim_1 = simple_pubnet.get_edge("Author", "Publication").similarity(
-            publication_ids, method
-        )
-        t_1 = time.time() - t_start
+        sim_1 = edges.similarity(publication_ids, method)
+        distances = edges._distance_cache
 
-        t_start = time.time()
-        sim_2 = simple_pubnet.get_edge("Author", "Publication").similarity(
-            publication_ids, method
-        )
-        t_2 = time.time() - t_start
+        def fail(*args, **kwds):
+            raise AssertionError("Overlap was recalculated.")
+
+        monkeypatch.setattr(edges, "overlap", fail)
+        sim_2 = edges.similarity(publication_ids, method)
 
-        assert t_2 < t_1
+        assert edges._distance_cache is distances
         assert np.all(sim_1 == sim_2)